@@ -1,120 +1,191 @@
 #!/usr/bin/env python3
 
-from poker import ExactProbabilityCalculator, parse_card
+import random
+import sys
+from functools import lru_cache
+from itertools import permutations
 
-def demo_mathematical_methods():
-    """Demonstrate the difference between exact and Monte Carlo methods."""
+# poker is imported inside the functions that need it: importing it builds the
+# hand-ranking tables, which the text-only sections never use.
+
+@lru_cache(maxsize=256)
+def _exact_cached(player_key, community_key, opps):
+    """Memoized exact calculation keyed by sorted card ids."""
+    from poker import ExactProbabilityCalculator
+    
+    # The calculator takes card ids directly, so the key needs no conversion back to cards
+    return ExactProbabilityCalculator.calculate_exact_probability(
+        list(player_key), list(community_key), opps
+    )
+
+# Every relabelling of the four suits (card id = rank << 2 | suit)
+_SUIT_PERMUTATIONS = tuple(permutations(range(4)))
+
+def _canonicalize(player_cards, community_cards):
+    """Return (player_key, community_key): sorted card ids with the suits relabelled canonically.
+    
+    Renaming the suits never changes the odds, so every deal is mapped to the smallest key
+    among its 24 suit relabellings; e.g. AS KS and AH KH share one key.
+    """
+    player_ids = [card.id for card in player_cards]
+    community_ids = [card.id for card in community_cards]
+    return min(
+        (tuple(sorted(card_id & ~3 | perm[card_id & 3] for card_id in player_ids)),
+         tuple(sorted(card_id & ~3 | perm[card_id & 3] for card_id in community_ids)))
+        for perm in _SUIT_PERMUTATIONS
+    )
+
+def exact_probability(player_cards, community_cards, opps):
+    """Exact probability for the given cards, reusing earlier results for the same deal."""
+    # The calculation only depends on which cards are known, not their order or suit names.
+    player_key, community_key = _canonicalize(player_cards, community_cards)
+    return _exact_cached(player_key, community_key, opps)
+
+# One Monte Carlo result row, filled straight from the result dict
+_ROW_FMT = (
+    "📊 {iterations:,} simulations:\n"
+    "   Win: {win_probability:.3f}%\n"
+    "   Tie: {tie_probability:.3f}%\n"
+    "   Lose: {lose_probability:.3f}%\n"
+)
+_ERROR_FMT = "   Error: ±{:.3f}% from exact value\n"
+_EQUITY_FMT = "⚖️ Equity over {:,} simulations: {:.3%} (exact: {:.3%})\n"
+
+def demo_mathematical_methods(demo_variance=False):
+    """Demonstrate the difference between exact and Monte Carlo methods.
+    
+    The Monte Carlo comparison runs only when demo_variance is True; otherwise the
+    exact result is all there is to show.
+    """
+    from poker import ExactProbabilityCalculator, parse_card
     
-    print("🧮 MATHEMATICAL METHODS COMPARISON")
-    print("=" * 50)
+    # Output is collected and written in one go rather than one print() per line.
+    buf = []
+    
+    buf.append("🧮 MATHEMATICAL METHODS COMPARISON\n")
+    buf.append("=" * 50 + "\n")
     
     # Simple heads-up scenario with pocket aces
     player_cards = [parse_card("AS"), parse_card("AC")]
     community_cards = [parse_card("KH"), parse_card("QD"), parse_card("JS")]
     
-    print(f"📋 Scenario: Pocket Aces vs 1 opponent")
-    print(f"🂠 Your cards: {' '.join(repr(card) for card in player_cards)}")
-    print(f"🂡 Community: {' '.join(repr(card) for card in community_cards)}")
-    print()
+    buf.append(f"📋 Scenario: Pocket Aces vs 1 opponent\n")
+    buf.append(f"🂠 Your cards: {' '.join(repr(card) for card in player_cards)}\n")
+    buf.append(f"🂡 Community: {' '.join(repr(card) for card in community_cards)}\n")
+    buf.append("\n")
     
     # Method 1: Exact Combinatorial Analysis
-    print("🧮 METHOD 1: EXACT COMBINATORIAL ANALYSIS")
-    print("-" * 40)
+    buf.append("🧮 METHOD 1: EXACT COMBINATORIAL ANALYSIS\n")
+    buf.append("-" * 40 + "\n")
+    exact_result = None
     try:
-        exact_result = ExactProbabilityCalculator.calculate_exact_probability(
-            player_cards, community_cards, 1
-        )
+        exact_result = exact_probability(player_cards, community_cards, 1)
         if exact_result:
-            print(f"✅ EXACT RESULT:")
-            print(f"   Win: {exact_result['win_probability']:.3f}%")
-            print(f"   Tie: {exact_result['tie_probability']:.3f}%")
-            print(f"   Lose: {exact_result['lose_probability']:.3f}%")
-            print(f"   Based on: {exact_result['total_scenarios']:,} scenarios")
-            print(f"   ⭐ Mathematically perfect - no approximation!")
+            buf.append(f"✅ EXACT RESULT:\n")
+            buf.append(f"   Win: {exact_result['win_probability']:.3f}%\n")
+            buf.append(f"   Tie: {exact_result['tie_probability']:.3f}%\n")
+            buf.append(f"   Lose: {exact_result['lose_probability']:.3f}%\n")
+            buf.append(f"   Based on: {exact_result['total_scenarios']:,} scenarios\n")
+            buf.append(f"   ⭐ Mathematically perfect - no approximation!\n")
     except Exception as e:
-        print(f"❌ Exact method failed: {e}")
+        buf.append(f"❌ Exact method failed: {e}\n")
+    
+    buf.append("\n")
     
-    print()
+    if not demo_variance:
+        buf.append("💡 Run with --variance-demo to compare against Monte Carlo simulation.\n")
+        sys.stdout.write("".join(buf))
+        return
     
     # Method 2: Monte Carlo Simulation (multiple runs to show variance)
-    print("🎲 METHOD 2: MONTE CARLO SIMULATION")
-    print("-" * 40)
+    buf.append("🎲 METHOD 2: MONTE CARLO SIMULATION\n")
+    buf.append("-" * 40 + "\n")
+    # Show everything so far before the (slow) simulation starts
+    sys.stdout.write("".join(buf))
+    sys.stdout.flush()
+    buf.clear()
     
     iterations_list = [1000, 10000, 100000]
     
-    for iterations in iterations_list:
-        mc_result = ExactProbabilityCalculator.monte_carlo_simulation(
-            player_cards, community_cards, 1, iterations
-        )
-        print(f"📊 {iterations:,} simulations:")
-        print(f"   Win: {mc_result['win_probability']:.3f}%")
-        print(f"   Tie: {mc_result['tie_probability']:.3f}%")
-        print(f"   Lose: {mc_result['lose_probability']:.3f}%")
+    # One simulation run, read out at each iteration count and split across
+    # three processes. Seeded so the printed errors are the same from run to run.
+    rng = random.Random(42)
+    mc_results = ExactProbabilityCalculator.monte_carlo_simulation_batched(
+        player_cards, community_cards, 1, iterations_list, paired_deals=True, rng=rng, workers=3
+    )
+    
+    for mc_result in mc_results:
+        buf.append(_ROW_FMT.format_map(mc_result))
         
         if exact_result:
             win_error = abs(mc_result['win_probability'] - exact_result['win_probability'])
-            print(f"   Error: ±{win_error:.3f}% from exact value")
-        print()
+            buf.append(_ERROR_FMT.format(win_error))
+        buf.append("\n")
+    
+    if exact_result:
+        # Equity of the longest run, from the same deals as its figures above
+        mc_equity = ExactProbabilityCalculator.equity(mc_results[-1])
+        exact_equity = ExactProbabilityCalculator.equity(exact_result)
+        buf.append(_EQUITY_FMT.format(iterations_list[-1], mc_equity, exact_equity))
+    
+    sys.stdout.write("".join(buf))
+
+_SUPERIORITY_TEXT = """
+🎯 WHY EXACT CALCULATION IS SUPERIOR:
+==================================================
+1. 🎯 PERFECT ACCURACY
+   • Exact: 100.000% accurate
+   • Monte Carlo: ~99% accurate (with enough samples)
+
+2. ⚡ DETERMINISTIC RESULTS
+   • Exact: Same result every time
+   • Monte Carlo: Different results each run
+
+3. 🧮 MATHEMATICAL RIGOR
+   • Exact: Pure combinatorial mathematics
+   • Monte Carlo: Statistical approximation
+
+4. 📊 COMPUTATIONAL EFFICIENCY (for small scenarios)
+   • Exact: Counts all possibilities once
+   • Monte Carlo: Samples repeatedly
+
+5. ✅ PROVABLE CORRECTNESS
+   • Exact: Mathematically provable
+   • Monte Carlo: Probabilistically correct
+"""
 
 def explain_mathematical_superiority():
     """Explain why exact calculation is superior."""
-    
-    print("\n🎯 WHY EXACT CALCULATION IS SUPERIOR:")
-    print("=" * 50)
-    
-    print("1. 🎯 PERFECT ACCURACY")
-    print("   • Exact: 100.000% accurate")
-    print("   • Monte Carlo: ~99% accurate (with enough samples)")
-    print()
-    
-    print("2. ⚡ DETERMINISTIC RESULTS")
-    print("   • Exact: Same result every time")
-    print("   • Monte Carlo: Different results each run")
-    print()
-    
-    print("3. 🧮 MATHEMATICAL RIGOR")
-    print("   • Exact: Pure combinatorial mathematics")
-    print("   • Monte Carlo: Statistical approximation")
-    print()
-    
-    print("4. 📊 COMPUTATIONAL EFFICIENCY (for small scenarios)")
-    print("   • Exact: Counts all possibilities once")
-    print("   • Monte Carlo: Samples repeatedly")
-    print()
-    
-    print("5. ✅ PROVABLE CORRECTNESS")
-    print("   • Exact: Mathematically provable")
-    print("   • Monte Carlo: Probabilistically correct")
+    sys.stdout.write(_SUPERIORITY_TEXT)
+
+_WHEN_TO_USE_TEXT = """
+🤔 WHEN TO USE EACH METHOD:
+==================================================
+🧮 USE EXACT CALCULATION WHEN:
+   • ≤2 opponents
+   • ≤2M hands to rank (suit-symmetric boards count once)
+   • Need perfect accuracy
+   • Results will be used for research/theory
+
+🎲 USE MONTE CARLO WHEN:
+   • >2 opponents
+   • >2M hands to rank (e.g. preflop)
+   • Speed is more important than perfect accuracy
+   • ~1% error margin is acceptable
+
+🚀 OUR HYBRID APPROACH:
+   • Automatically chooses the best method
+   • Exact when possible, Monte Carlo when necessary
+   • Gives you mathematical precision OR speed
+"""
 
 def when_to_use_each_method():
     """Explain when to use each method."""
-    
-    print("\n🤔 WHEN TO USE EACH METHOD:")
-    print("=" * 50)
-    
-    print("🧮 USE EXACT CALCULATION WHEN:")
-    print("   • ≤2 opponents")
-    print("   • ≤10 unknown cards total")
-    print("   • <1M possible scenarios")
-    print("   • Need perfect accuracy")
-    print("   • Results will be used for research/theory")
-    print()
-    
-    print("🎲 USE MONTE CARLO WHEN:")
-    print("   • >2 opponents")
-    print("   • >10 unknown cards")
-    print("   • >1M possible scenarios")
-    print("   • Speed is more important than perfect accuracy")
-    print("   • ~1% error margin is acceptable")
-    print()
-    
-    print("🚀 OUR HYBRID APPROACH:")
-    print("   • Automatically chooses the best method")
-    print("   • Exact when possible, Monte Carlo when necessary")
-    print("   • Gives you mathematical precision OR speed")
+    sys.stdout.write(_WHEN_TO_USE_TEXT)
 
 if __name__ == "__main__":
-    demo_mathematical_methods()
+    if "--explain-only" not in sys.argv:
+        demo_mathematical_methods(demo_variance="--variance-demo" in sys.argv)
     explain_mathematical_superiority()
     when_to_use_each_method()
     
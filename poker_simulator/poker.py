@@ -1,13 +1,261 @@
 import random
 import math
+import operator
+import os
+from array import array
+from bisect import bisect_left
 from collections import Counter
+from dataclasses import dataclass, field
+from functools import reduce
 import argparse
-from itertools import combinations
+from itertools import combinations, permutations
 
+# Lookup-table hand ranking (Cactus Kev style): every 5-card hand maps to one of
+# 7462 equivalence classes, 1 = royal flush ... 7462 = 7-5-4-3-2 unsuited.
+# Lower is stronger, so hands compare with a single integer comparison.
+RANK_ORDER = "23456789TJQKA"
+RANK_INDEX = {rank: i for i, rank in enumerate(RANK_ORDER)}
+SUIT_ORDER = "SCHD"
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUIT_ORDER)}
+RANK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+WORST_RANK = 7462
+
+# The calculators work on card ids 0-51 (rank index << 2 | suit index), so the
+# per-card rank bit is precomputed by id.
+ID_RANK_BITS = tuple(1 << (card_id >> 2) for card_id in range(52))
+# Rank bit pattern of each straight -> value of its high card, strongest first
+# (A-high down to 6-high, then the wheel A-2-3-4-5, which plays 5-high)
+STRAIGHT_HIGHS = {0b1111100000000 >> i: 14 - i for i in range(9)}
+STRAIGHT_HIGHS[0b1000000001111] = 5
+
+# One 4-bit counter per rank: summing these over a hand packs its rank histogram into one int
+ID_RANK_NIBBLES = tuple(1 << 4 * (card_id >> 2) for card_id in range(52))
+
+def _build_lookup_tables():
+    """Build the flush table (indexed by rank bitmask) and unsuited table (keyed by prime product)."""
+    flush_lookup = [0] * (1 << 13)
+    unsuited_lookup = {}
+    descending = range(12, -1, -1)
+    
+    # A-high straight down to 6-high, then the wheel (A-2-3-4-5)
+    straights = sorted(STRAIGHT_HIGHS, key=STRAIGHT_HIGHS.get, reverse=True)
+    # All 5 distinct ranks that don't form a straight, strongest first
+    no_pairs = [combo for combo in combinations(descending, 5)
+                if sum(1 << r for r in combo) not in STRAIGHT_HIGHS]
+    
+    def prime_product(ranks):
+        product = 1
+        for r in ranks:
+            product *= RANK_PRIMES[r]
+        return product
+    
+    def bits_to_ranks(bits):
+        return [r for r in range(13) if bits >> r & 1]
+    
+    rank = 1
+    # Straight flushes (including the royal flush)
+    for bits in straights:
+        flush_lookup[bits] = rank
+        rank += 1
+    # Four of a kind
+    for quad in descending:
+        for kicker in descending:
+            if kicker != quad:
+                unsuited_lookup[prime_product([quad] * 4 + [kicker])] = rank
+                rank += 1
+    # Full house
+    for trips in descending:
+        for pair in descending:
+            if pair != trips:
+                unsuited_lookup[prime_product([trips] * 3 + [pair] * 2)] = rank
+                rank += 1
+    # Flush
+    for combo in no_pairs:
+        flush_lookup[sum(1 << r for r in combo)] = rank
+        rank += 1
+    # Straight
+    for bits in straights:
+        unsuited_lookup[prime_product(bits_to_ranks(bits))] = rank
+        rank += 1
+    # Three of a kind
+    for trips in descending:
+        kickers = [r for r in descending if r != trips]
+        for combo in combinations(kickers, 2):
+            unsuited_lookup[prime_product([trips] * 3 + list(combo))] = rank
+            rank += 1
+    # Two pair
+    for high, low in combinations(descending, 2):
+        for kicker in descending:
+            if kicker != high and kicker != low:
+                unsuited_lookup[prime_product([high, high, low, low, kicker])] = rank
+                rank += 1
+    # Pair
+    for pair in descending:
+        kickers = [r for r in descending if r != pair]
+        for combo in combinations(kickers, 3):
+            unsuited_lookup[prime_product([pair, pair] + list(combo))] = rank
+            rank += 1
+    # High card
+    for combo in no_pairs:
+        unsuited_lookup[prime_product(combo)] = rank
+        rank += 1
+    
+    assert rank == WORST_RANK + 1
+    return flush_lookup, unsuited_lookup
+
+# Both stay plain Python containers: reading from an array('h') would box a new int
+# object for every lookup above 256, roughly tripling the cost of a table read.
+FLUSH_TABLE, UNSUITED_TABLE = _build_lookup_tables()
+
+# Upper rank bound of each hand category, strongest first
+_CATEGORY_BOUNDS = (1, 10, 166, 322, 1599, 1609, 2467, 3325, 6185, WORST_RANK)
+_CATEGORY_NAMES = ("Royal Flush", "Straight Flush", "Four of a Kind", "Full House", "Flush",
+                   "Straight", "Three of a Kind", "Two Pair", "Pair", "High Card")
+
+# Category id (index into _CATEGORY_NAMES) and label of every rank; index 0 is unused so ranks index directly
+_RANK_TO_CATEGORY_ID = (None,) + tuple(bisect_left(_CATEGORY_BOUNDS, rank) for rank in range(1, WORST_RANK + 1))
+_RANK_TO_CATEGORY = (None,) + tuple(_CATEGORY_NAMES[category_id] for category_id in _RANK_TO_CATEGORY_ID[1:])
+
+def hand_category(rank):
+    """Return the hand type label ("Flush", "Pair", ...) for a 1-7462 rank."""
+    return _RANK_TO_CATEGORY[rank]
+
+def hand_category_id(rank):
+    """Return the category id of a 1-7462 rank: 0 for Royal Flush up to 9 for High Card."""
+    return _RANK_TO_CATEGORY_ID[rank]
+
+def evaluate5(c0, c1, c2, c3, c4):
+    """Return the 1-7462 rank of 5 Cactus Kev card keys (lower is stronger)."""
+    if c0 & c1 & c2 & c3 & c4 & 0xF000:
+        return FLUSH_TABLE[(c0 | c1 | c2 | c3 | c4) >> 16]
+    return UNSUITED_TABLE[(c0 & 0xFF) * (c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF)]
+
+# Positions of the 21 five-card hands inside a 7-card hand
+_COMBOS_7C5 = tuple(combinations(range(7), 5))
+
+# Best-hand ranks for 5-7 card rank patterns, filled in the first time each pattern is seen:
+# flush ranks keyed by the flush suit's rank bitmask, the rest by the packed rank histogram.
+_FLUSH_RANKS = {bits: rank for bits, rank in enumerate(FLUSH_TABLE) if rank}
+_HISTOGRAM_RANKS = {}
+
+def _best_flush_rank(suit_bits):
+    """Rank of the best 5-card flush (or straight flush) within one suit's rank bitmask."""
+    # A straight flush beats any plain flush; STRAIGHT_HIGHS lists the strongest first
+    for best_five in STRAIGHT_HIGHS:
+        if suit_bits & best_five == best_five:
+            break
+    else:
+        # Otherwise the five highest cards make the best flush: drop the lowest until five are left
+        best_five = suit_bits
+        while best_five.bit_count() > 5:
+            best_five &= best_five - 1
+    best = FLUSH_TABLE[best_five]
+    _FLUSH_RANKS[suit_bits] = best
+    return best
+
+def _best_histogram_rank(histogram):
+    """Rank of the best non-flush 5-card hand for a packed rank histogram."""
+    primes = []
+    for r in range(13):
+        primes += [RANK_PRIMES[r]] * (histogram >> 4 * r & 0xF)
+    best = min(UNSUITED_TABLE[math.prod(five)] for five in combinations(primes, 5))
+    _HISTOGRAM_RANKS[histogram] = best
+    return best
+
+def evaluate7(card_ids):
+    """Return the rank of the best 5-card hand among 5-7 card ids (lower is stronger).
+    
+    The hand is reduced to a packed rank histogram plus one rank bitmask per suit.
+    Five cards of one suit rule out quads and full houses, so the answer is then the
+    best flush in that suit; otherwise only the rank histogram matters. Both are
+    looked up directly rather than trying all 21 five-card subsets.
+    """
+    histogram = 0
+    suit_bits = [0, 0, 0, 0]
+    for card_id in card_ids:
+        histogram += ID_RANK_NIBBLES[card_id]
+        suit_bits[card_id & 3] |= ID_RANK_BITS[card_id]
+    
+    for bits in suit_bits:
+        if bits.bit_count() >= 5:
+            rank = _FLUSH_RANKS.get(bits)
+            return rank if rank is not None else _best_flush_rank(bits)
+    
+    rank = _HISTOGRAM_RANKS.get(histogram)
+    return rank if rank is not None else _best_histogram_rank(histogram)
+
+def summarize_board(board_ids):
+    """Return (rank histogram, flush suit, flush suit bitmask) for a 5-card board.
+    
+    Only a suit with 3+ board cards can make a flush, and at most one suit can;
+    flush suit is -1 when there is none.
+    """
+    board_histogram = 0
+    board_suits = [0, 0, 0, 0]
+    for card_id in board_ids:
+        board_histogram += ID_RANK_NIBBLES[card_id]
+        board_suits[card_id & 3] |= ID_RANK_BITS[card_id]
+    
+    flush_suit = -1
+    for suit, bits in enumerate(board_suits):
+        if bits.bit_count() >= 3:
+            flush_suit = suit
+    return board_histogram, flush_suit, board_suits[flush_suit]
+
+def evaluate7_pairs(card_ids, board_ids):
+    """Rank every two-card hand dealt from card_ids against the same 5-card board.
+    
+    Ranks come back in combinations(card_ids, 2) order (lower is stronger). The board
+    is summarized once (see summarize_board), and the board plus each first card is
+    summed once and shared by all of that card's hands, so the inner loop only adds
+    the second card.
+    """
+    board_histogram, flush_suit, flush_bits = summarize_board(board_ids)
+    rank_bits = ID_RANK_BITS
+    nibbles = ID_RANK_NIBBLES
+    flush_ranks = _FLUSH_RANKS
+    histogram_ranks = _HISTOGRAM_RANKS
+    ranks = []
+    append = ranks.append
+    
+    for i, first in enumerate(card_ids):
+        first_histogram = board_histogram + nibbles[first]
+        first_bits = flush_bits | rank_bits[first] if first & 3 == flush_suit else flush_bits
+        for second in card_ids[i + 1:]:
+            if flush_suit >= 0:
+                bits = first_bits | rank_bits[second] if second & 3 == flush_suit else first_bits
+                if bits.bit_count() >= 5:
+                    append(flush_ranks.get(bits) or _best_flush_rank(bits))
+                    continue
+            histogram = first_histogram + nibbles[second]
+            append(histogram_ranks.get(histogram) or _best_histogram_rank(histogram))
+    return ranks
+
+@dataclass(slots=True, frozen=True)
 class Card:
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
+    rank: str
+    suit: str
+    # Compact integer form used by the calculators: rank index << 2 | suit index.
+    id: int = field(init=False, repr=False)
+    # Cactus Kev encoding: rank bit << 16 | suit bit << 12 | rank index << 8 | rank prime.
+    # Same-suit hands share a suit bit (AND), and OR-ing keys collects the rank bits.
+    key: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        rank_index = RANK_INDEX[self.rank]
+        suit_index = SUIT_INDEX[self.suit]
+        object.__setattr__(self, "id", rank_index << 2 | suit_index)
+        object.__setattr__(self, "key", (1 << rank_index) << 16 | (1 << suit_index) << 12
+                           | rank_index << 8 | RANK_PRIMES[rank_index])
+    
+    @staticmethod
+    def from_id(card_id):
+        return CARD_CACHE[(RANK_ORDER[card_id >> 2], SUIT_ORDER[card_id & 3])]
+    
+    @staticmethod
+    def to_id_array(cards):
+        """Pack cards (Card objects or plain card ids) into a compact signed-byte array of ids."""
+        return array('b', (card if isinstance(card, int) else card.id for card in cards))
     
     def __repr__(self):
         # This is great for debugging and compact display.
@@ -23,6 +271,18 @@ class Card:
         suit_name = suit_map.get(self.suit, self.suit)
         return f"{rank_name} of {suit_name}"
 
+# Cards are immutable, so each of the 52 is built once and shared
+CARD_CACHE = {(rank, suit): Card(rank, suit) for suit in SUIT_ORDER for rank in RANK_ORDER}
+
+# Card string ("AS") <-> card id, for code that passes plain ids instead of Card objects
+CARD_TO_ID = {rank + suit: card.id for (rank, suit), card in CARD_CACHE.items()}
+_CARD_STR_TO_CARD = {rank + suit: card for (rank, suit), card in CARD_CACHE.items()}
+ID_TO_CARD = tuple(RANK_ORDER[card_id >> 2] + SUIT_ORDER[card_id & 3] for card_id in range(52))
+
+def format_card(card_id):
+    """Short display form ("AS") of a card id."""
+    return ID_TO_CARD[card_id]
+
 class Deck:
     def __init__(self):
         # Using single characters for suits and ranks makes parsing and comparison easier.
@@ -30,7 +290,7 @@ class Deck:
         # T=10, J=Jack, Q=Queen, K=King, A=Ace
         suits = "SCHD"
         ranks = "23456789TJQKA"
-        self.cards = [Card(rank, suit) for suit in suits for rank in ranks]
+        self.cards = [CARD_CACHE[(rank, suit)] for suit in suits for rank in ranks]
     
     def __str__(self):
         # This joins all the card strings with a newline in between.
@@ -61,20 +321,6 @@ class Player:
         return f"{self.name}'s hand: {' '.join(repr(card) for card in self.hand)}"
 
 class HandEvaluator:
-    # Hand rankings from weakest to strongest
-    HAND_RANKINGS = {
-        "High Card": 1,
-        "Pair": 2,
-        "Two Pair": 3,
-        "Three of a Kind": 4,
-        "Straight": 5,
-        "Flush": 6,
-        "Full House": 7,
-        "Four of a Kind": 8,
-        "Straight Flush": 9,
-        "Royal Flush": 10
-    }
-    
     # Approximate hand strength percentages (how strong each hand type is)
     HAND_STRENGTH_PERCENTAGES = {
         "High Card": 10,        # Weakest hands
@@ -89,6 +335,9 @@ class HandEvaluator:
         "Royal Flush": 100     # Perfect hand
     }
     
+    # The same percentages indexed by category id (see hand_category_id)
+    CATEGORY_STRENGTH_PERCENTAGES = tuple(map(HAND_STRENGTH_PERCENTAGES.get, _CATEGORY_NAMES))
+    
     # Card rank values for comparison (A can be high or low)
     RANK_VALUES = {
         '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, 
@@ -104,27 +353,29 @@ class HandEvaluator:
         """Get the approximate strength percentage for a hand type."""
         return HandEvaluator.HAND_STRENGTH_PERCENTAGES.get(hand_type, 0)
     
+    @staticmethod
+    def get_category_strength_percentage(category_id):
+        """Get the approximate strength percentage for a category id from hand_category_id."""
+        return HandEvaluator.CATEGORY_STRENGTH_PERCENTAGES[category_id]
+    
+    @staticmethod
+    def get_rank_strength_percentage(rank):
+        """Get the percentage of the 7462 hand classes a 1-7462 rank beats (lower rank is stronger)."""
+        return (WORST_RANK - rank) * 100 // WORST_RANK
+    
     @staticmethod
     def is_flush(cards):
         """Check if all cards have the same suit."""
-        suits = [card.suit for card in cards]
-        return len(set(suits)) == 1
+        # Only a suit bit shared by every card survives the AND
+        return reduce(operator.and_, (card.key for card in cards)) & 0xF000 != 0
     
     @staticmethod
     def is_straight(cards):
         """Check if cards form a straight (5 consecutive ranks)."""
-        ranks = [HandEvaluator.get_rank_value(card.rank) for card in cards]
-        ranks.sort()
-        
-        # Check for normal straight
-        for i in range(1, len(ranks)):
-            if ranks[i] != ranks[i-1] + 1:
-                # Check for A-2-3-4-5 straight (wheel)
-                if ranks == [2, 3, 4, 5, 14]:
-                    return True, 5  # Return 5 as high card for wheel
-                return False, 0
-        
-        return True, ranks[-1]  # Return highest card
+        # OR-ing the rank bits gives one of 10 patterns only for 5 distinct consecutive ranks
+        rank_bits = reduce(operator.or_, (card.key for card in cards)) >> 16
+        high = STRAIGHT_HIGHS.get(rank_bits, 0)
+        return high != 0, high  # 5 is the high card of the wheel (A-2-3-4-5)
     
     @staticmethod
     def get_rank_counts(cards):
@@ -134,129 +385,204 @@ class HandEvaluator:
     
     @staticmethod
     def evaluate_hand(cards):
-        """Evaluate a 5-card hand and return (hand_type, rank, tie_breakers)."""
+        """Evaluate a 5-card hand and return its 1-7462 rank (lower is stronger).
+        
+        hand_category(rank) gives the hand type label.
+        """
         if len(cards) != 5:
             raise ValueError("Hand must have exactly 5 cards")
         
-        # Sort cards by rank value for easier analysis
-        sorted_cards = sorted(cards, key=lambda x: HandEvaluator.get_rank_value(x.rank))
-        
-        is_flush = HandEvaluator.is_flush(sorted_cards)
-        is_straight, straight_high = HandEvaluator.is_straight(sorted_cards)
-        rank_counts = HandEvaluator.get_rank_counts(sorted_cards)
-        
-        # Get counts in descending order
-        counts = sorted(rank_counts.values(), reverse=True)
-        ranks_by_count = sorted(rank_counts.keys(), key=lambda x: (rank_counts[x], HandEvaluator.get_rank_value(x)), reverse=True)
-        
-        # Check for each hand type from strongest to weakest
-        
-        # Royal Flush: A-K-Q-J-10 all same suit
-        if is_flush and is_straight and straight_high == 14:
-            return "Royal Flush", HandEvaluator.HAND_RANKINGS["Royal Flush"], [14]
-        
-        # Straight Flush: 5 consecutive cards, all same suit
-        if is_flush and is_straight:
-            return "Straight Flush", HandEvaluator.HAND_RANKINGS["Straight Flush"], [straight_high]
-        
-        # Four of a Kind: 4 cards of same rank
-        if counts == [4, 1]:
-            four_kind = ranks_by_count[0]
-            kicker = ranks_by_count[1]
-            return "Four of a Kind", HandEvaluator.HAND_RANKINGS["Four of a Kind"], [HandEvaluator.get_rank_value(four_kind), HandEvaluator.get_rank_value(kicker)]
-        
-        # Full House: 3 of a kind + pair
-        if counts == [3, 2]:
-            three_kind = ranks_by_count[0]
-            pair = ranks_by_count[1]
-            return "Full House", HandEvaluator.HAND_RANKINGS["Full House"], [HandEvaluator.get_rank_value(three_kind), HandEvaluator.get_rank_value(pair)]
-        
-        # Flush: 5 cards of same suit
-        if is_flush:
-            kickers = [HandEvaluator.get_rank_value(card.rank) for card in sorted_cards]
-            kickers.sort(reverse=True)
-            return "Flush", HandEvaluator.HAND_RANKINGS["Flush"], kickers
-        
-        # Straight: 5 consecutive cards
-        if is_straight:
-            return "Straight", HandEvaluator.HAND_RANKINGS["Straight"], [straight_high]
-        
-        # Three of a Kind: 3 cards of same rank
-        if counts == [3, 1, 1]:
-            three_kind = ranks_by_count[0]
-            kickers = [HandEvaluator.get_rank_value(rank) for rank in ranks_by_count[1:]]
-            kickers.sort(reverse=True)
-            return "Three of a Kind", HandEvaluator.HAND_RANKINGS["Three of a Kind"], [HandEvaluator.get_rank_value(three_kind)] + kickers
-        
-        # Two Pair: 2 pairs
-        if counts == [2, 2, 1]:
-            pairs = [HandEvaluator.get_rank_value(rank) for rank in ranks_by_count[:2]]
-            pairs.sort(reverse=True)
-            kicker = HandEvaluator.get_rank_value(ranks_by_count[2])
-            return "Two Pair", HandEvaluator.HAND_RANKINGS["Two Pair"], pairs + [kicker]
-        
-        # Pair: 2 cards of same rank
-        if counts == [2, 1, 1, 1]:
-            pair = HandEvaluator.get_rank_value(ranks_by_count[0])
-            kickers = [HandEvaluator.get_rank_value(rank) for rank in ranks_by_count[1:]]
-            kickers.sort(reverse=True)
-            return "Pair", HandEvaluator.HAND_RANKINGS["Pair"], [pair] + kickers
-        
-        # High Card: no other hand
-        kickers = [HandEvaluator.get_rank_value(card.rank) for card in sorted_cards]
-        kickers.sort(reverse=True)
-        return "High Card", HandEvaluator.HAND_RANKINGS["High Card"], kickers
+        return evaluate5(*[card.key for card in cards])
     
     @staticmethod
     def find_best_hand(cards):
-        """Find the best 5-card hand from a list of cards (5-7 cards)."""
+        """Find the best 5-card hand from a list of cards (5-7 cards).
+        
+        Returns (rank, best_cards), where rank is the 1-7462 rank of best_cards.
+        """
         if len(cards) < 5:
             raise ValueError("Need at least 5 cards to evaluate")
         
         if len(cards) == 5:
-            hand_type, rank, tie_breakers = HandEvaluator.evaluate_hand(cards)
-            return hand_type, rank, tie_breakers, cards
+            return HandEvaluator.evaluate_hand(cards), cards
         
-        # Try all possible 5-card combinations and find the best
-        best_hand = None
-        best_rank = 0
-        best_tie_breakers = []
-        best_cards = []
+        # Try all possible 5-card combinations and find the best (lowest table rank)
+        keys = [card.key for card in cards]
+        index_sets = _COMBOS_7C5 if len(cards) == 7 else combinations(range(len(cards)), 5)
+        best_rank = WORST_RANK + 1
+        best_indices = None
         
-        for five_cards in combinations(cards, 5):
-            hand_type, rank, tie_breakers = HandEvaluator.evaluate_hand(list(five_cards))
-            
-            # Compare hands
-            if rank > best_rank or (rank == best_rank and tie_breakers > best_tie_breakers):
-                best_hand = hand_type
+        for indices in index_sets:
+            a, b, c, d, e = indices
+            rank = evaluate5(keys[a], keys[b], keys[c], keys[d], keys[e])
+            if rank < best_rank:
                 best_rank = rank
-                best_tie_breakers = tie_breakers
-                best_cards = list(five_cards)
+                best_indices = indices
         
-        return best_hand, best_rank, best_tie_breakers, best_cards
+        return best_rank, [cards[i] for i in best_indices]
     
     @staticmethod
-    def compare_hands(hand1_result, hand2_result):
-        """Compare two hand evaluation results. Returns 1 if hand1 wins, -1 if hand2 wins, 0 if tie."""
-        _, rank1, tie_breakers1 = hand1_result
-        _, rank2, tie_breakers2 = hand2_result
-        
-        if rank1 > rank2:
-            return 1
-        elif rank1 < rank2:
-            return -1
+    def compare_hands(rank1, rank2):
+        """Compare two hand ranks. Returns 1 if hand1 wins, -1 if hand2 wins, 0 if tie."""
+        # Lower rank is stronger
+        return (rank1 < rank2) - (rank1 > rank2)
+
+def _mc_kernel(player_ids, community_ids, remaining_ids, num_opponents, iterations, checkpoints,
+               paired_deals=True, rng=random):
+    """Simulation loop behind monte_carlo_simulation_batched, working on card ids.
+    
+    Returns {checkpoint: (wins, ties)} for each iteration count in checkpoints.
+    Everything the loop touches is bound to a local first, so each iteration
+    skips the global and attribute lookups.
+    
+    Only the cards a deal needs are shuffled into place (a partial Fisher-Yates
+    shuffle of the first few positions), not the whole deck. With paired_deals=True
+    twice that many are drawn and split into two deals that share no cards. This
+    only halves the number of shuffles; the two deals are close to independent, so
+    it is not a variance-reduction technique and the error is that of plain sampling.
+    rng is a random.Random or the random module.
+    """
+    random_float = rng.random
+    rank_bits = ID_RANK_BITS
+    nibbles = ID_RANK_NIBBLES
+    flush_ranks = _FLUSH_RANKS
+    histogram_ranks = _HISTOGRAM_RANKS
+    unknown_community = 5 - len(community_ids)
+    opponent_starts = range(unknown_community, unknown_community + 2 * num_opponents, 2)
+    # The hand ranking from summarize_board and evaluate7_pairs, written out inline
+    # below: the board is summarized once per deal and each hand only adds its own two cards.
+    player_bits = [0, 0, 0, 0]
+    for card_id in player_ids:
+        player_bits[card_id & 3] |= rank_bits[card_id]
+    player_nibbles = nibbles[player_ids[0]] + nibbles[player_ids[1]]
+    # The known community cards are the same every deal, so only the drawn ones are added per deal
+    community_histogram = 0
+    community_suits = [0, 0, 0, 0]
+    for card_id in community_ids:
+        community_histogram += nibbles[card_id]
+        community_suits[card_id & 3] |= rank_bits[card_id]
+    unknown_positions = range(unknown_community)
+    board_fixed = unknown_community == 0
+    player_rank = 0
+    deck = remaining_ids[:]
+    deck_size = len(deck)
+    deal_size = unknown_community + 2 * num_opponents
+    # Paired deals only stay disjoint if the deck holds two full deals
+    paired = paired_deals and 2 * deal_size <= deck_size
+    draw_positions = range(2 * deal_size if paired else deal_size)
+    snapshots = {}
+    wins = 0
+    ties = 0
+    
+    for iteration in range(1, iterations + 1):
+        if paired and iteration % 2 == 0:
+            dealt = deck[deal_size:2 * deal_size]
         else:
-            # Same rank, compare tie breakers
-            for tb1, tb2 in zip(tie_breakers1, tie_breakers2):
-                if tb1 > tb2:
-                    return 1
-                elif tb1 < tb2:
-                    return -1
-            return 0  # Complete tie
+            # Swap a random card from the rest of the deck into each drawn position
+            for i in draw_positions:
+                j = i + int(random_float() * (deck_size - i))
+                deck[i], deck[j] = deck[j], deck[i]
+            dealt = deck
+        
+        # On the river the board, and so the player's rank, is the same every deal
+        if not (board_fixed and player_rank):
+            # Deal from the top of the drawn cards: community first, then opponents
+            board_histogram = community_histogram
+            board_suits = community_suits[:]
+            for i in unknown_positions:
+                card_id = dealt[i]
+                board_histogram += nibbles[card_id]
+                board_suits[card_id & 3] |= rank_bits[card_id]
+            # Same flush rule as summarize_board: only a suit with 3+ board cards
+            flush_suit = -1
+            for suit in range(4):
+                if board_suits[suit].bit_count() >= 3:
+                    flush_suit = suit
+            flush_bits = board_suits[flush_suit]
+            
+            player_rank = 0
+            if flush_suit >= 0:
+                bits = flush_bits | player_bits[flush_suit]
+                if bits.bit_count() >= 5:
+                    player_rank = flush_ranks.get(bits) or _best_flush_rank(bits)
+            if not player_rank:
+                histogram = board_histogram + player_nibbles
+                player_rank = histogram_ranks.get(histogram) or _best_histogram_rank(histogram)
+        
+        best_opponent = WORST_RANK + 1
+        for start in opponent_starts:
+            first = dealt[start]
+            second = dealt[start + 1]
+            opponent_rank = 0
+            if flush_suit >= 0:
+                bits = flush_bits
+                if first & 3 == flush_suit:
+                    bits |= rank_bits[first]
+                if second & 3 == flush_suit:
+                    bits |= rank_bits[second]
+                if bits.bit_count() >= 5:
+                    opponent_rank = flush_ranks.get(bits) or _best_flush_rank(bits)
+            if not opponent_rank:
+                histogram = board_histogram + nibbles[first] + nibbles[second]
+                opponent_rank = histogram_ranks.get(histogram) or _best_histogram_rank(histogram)
+            
+            if opponent_rank < best_opponent:
+                best_opponent = opponent_rank
+                if opponent_rank < player_rank:
+                    break  # Already lost; the other opponents can't change that
+        
+        # Booleans add as 0/1: a win beats every opponent, a tie matches the best one
+        wins += player_rank < best_opponent
+        ties += player_rank == best_opponent
+        
+        if iteration in checkpoints:
+            snapshots[iteration] = (wins, ties)
+    
+    return snapshots
+
+# Below this many deals per process, starting the process costs more than it saves
+MIN_ITERATIONS_PER_WORKER = 20_000
+
+# Process pool shared by every parallel run, so processes are only started once
+_executor = None
+_executor_workers = 0
+
+def _get_executor(workers):
+    """Return the shared process pool, (re)creating it when it has fewer than workers processes."""
+    global _executor, _executor_workers
+    # Imported here: concurrent.futures pulls in multiprocessing, which adds about half
+    # again to the import time of this module for runs that never go parallel.
+    from concurrent.futures import ProcessPoolExecutor
+    
+    if _executor is None or _executor_workers < workers:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+def _discard_executor():
+    """Drop the shared process pool (e.g. after a worker died) so the next run starts a fresh one."""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _executor_workers = 0
+
+def _mc_worker(player_ids, community_ids, remaining_ids, num_opponents, checkpoints, paired_deals, seed):
+    """Run one worker's share of a parallel simulation with its own seeded generator."""
+    return _mc_kernel(player_ids, community_ids, remaining_ids, num_opponents, max(checkpoints),
+                      set(checkpoints), paired_deals, random.Random(seed))
 
 class ExactProbabilityCalculator:
     """Exact combinatorial probability calculator for poker scenarios."""
     
+    # Shared by every Monte Carlo run unless the caller passes its own
+    _rng = random.Random()
+    # Largest count_hand_evaluations() estimate calculate_exact_probability will take on.
+    # Any flop is at most 1,070,190 hands (about 0.4-0.7s); a single known board card is 35M+.
+    MAX_EXACT_EVALUATIONS = 2_000_000
+    
     @staticmethod
     def combination(n, k):
         """Calculate C(n,k) = n! / (k! * (n-k)!)"""
@@ -267,24 +593,91 @@ class ExactProbabilityCalculator:
     @staticmethod
     def get_remaining_deck(known_cards):
         """Get all cards not in the known cards list."""
-        all_cards = set()
-        suits = "SCHD"
-        ranks = "23456789TJQKA"
+        return [Card.from_id(card_id) for card_id in ExactProbabilityCalculator.get_remaining_ids(known_cards)]
+    
+    @staticmethod
+    def get_remaining_ids(known_cards):
+        """Get the ids of all cards not in the known cards list (Card objects or ids)."""
+        # Bit i of the mask is set when card id i is already dealt
+        used_mask = 0
+        for card_id in Card.to_id_array(known_cards):
+            used_mask |= 1 << card_id
+        return [card_id for card_id in range(52) if not used_mask >> card_id & 1]
+    
+    @staticmethod
+    def get_suit_stabilizer(player_ids, community_ids=()):
+        """Get the suit permutations (tuples indexed by suit) that map the player's cards onto
+        themselves and the community cards onto themselves.
+        
+        Each group has to be fixed on its own: a relabeling that swapped a player card with a
+        community card would change who holds that card, and with it the outcome.
+        """
+        groups = [set(player_ids), set(community_ids)]
+        return [perm for perm in permutations(range(4))
+                if all(card_id & ~3 | perm[card_id & 3] in group for group in groups for card_id in group)]
+    
+    @staticmethod
+    def get_board_classes(player_ids, community_ids, remaining_ids, num_cards):
+        """Group the possible board completions into suit-equivalence classes.
         
-        for suit in suits:
-            for rank in ranks:
-                all_cards.add(f"{rank}{suit}")
+        Returns {representative board (tuple of ids): number of boards in its class}.
+        """
+        stabilizer = ExactProbabilityCalculator.get_suit_stabilizer(player_ids, community_ids)
+        boards = combinations(remaining_ids, num_cards)
+        if len(stabilizer) == 1:
+            # Only the identity: every board is its own class
+            return dict.fromkeys(boards, 1)
         
-        known_card_strs = {repr(card) for card in known_cards}
-        remaining = all_cards - known_card_strs
+        board_classes = {}
+        for board in boards:
+            canonical = min(tuple(sorted(card_id & ~3 | perm[card_id & 3] for card_id in board))
+                            for perm in stabilizer)
+            board_classes[canonical] = board_classes.get(canonical, 0) + 1
+        return board_classes
+    
+    @staticmethod
+    def count_hand_evaluations(player_ids, community_ids, num_unseen, unknown_community):
+        """Estimate how many hands the exact enumeration ranks: every hole pair on every board class.
         
-        return [parse_card(card_str) for card_str in remaining]
+        Each suit relabeling that fixes the player's cards and the community cards (see
+        get_suit_stabilizer) folds boards together, so the board count is divided by the
+        number of such relabelings (a lower bound on the classes).
+        """
+        symmetries = len(ExactProbabilityCalculator.get_suit_stabilizer(player_ids, community_ids))
+        board_classes = -(-math.comb(num_unseen, unknown_community) // symmetries)
+        return board_classes * math.comb(num_unseen - unknown_community, 2)
+    
+    @staticmethod
+    def count_opponent_deals(hands, num_opponents):
+        """Count the distinct sets of num_opponents non-overlapping hands that can be picked from hands.
+        
+        Only 0-2 opponents are supported (the exact calculation's limit). Two different
+        hands share at most one card, so the overlapping pairs are counted per shared card.
+        """
+        if num_opponents == 0:
+            return 1
+        if num_opponents == 1:
+            return len(hands)
+        if num_opponents == 2:
+            hands_per_card = [0] * 52
+            for first, second in hands:
+                hands_per_card[first] += 1
+                hands_per_card[second] += 1
+            # k hands through one card make k * (k - 1) / 2 overlapping pairs
+            overlapping = sum(k * (k - 1) for k in hands_per_card) // 2
+            return math.comb(len(hands), 2) - overlapping
+        raise ValueError("Counting is only supported for up to 2 opponents")
     
     @staticmethod
     def calculate_exact_probability(player_cards, community_cards, num_opponents):
-        """Calculate exact win probability using combinatorial analysis."""
+        """Calculate exact win probability using combinatorial analysis.
+        
+        Cards may be given as Card objects or as plain card ids (see parse_card_id).
+        """
         all_known = player_cards + community_cards
-        remaining_deck = ExactProbabilityCalculator.get_remaining_deck(all_known)
+        remaining_deck = ExactProbabilityCalculator.get_remaining_ids(all_known)
+        player_ids = Card.to_id_array(player_cards).tolist()
+        community_ids = Card.to_id_array(community_cards).tolist()
         
         # Number of unknown community cards (max 5 total)
         unknown_community = 5 - len(community_cards)
@@ -299,59 +692,54 @@ class ExactProbabilityCalculator:
         if total_unknown_cards > len(remaining_deck):
             raise ValueError("Not enough cards in deck for this scenario")
         
-        # For computational efficiency, limit exact calculation to reasonable scenarios
-        # Rough estimate: C(47,6) = 10M scenarios takes ~30 seconds
-        max_scenarios = ExactProbabilityCalculator.combination(len(remaining_deck), total_unknown_cards)
-        if num_opponents > 2 or total_unknown_cards > 10 or max_scenarios > 1000000:
+        # For computational efficiency, limit exact calculation to reasonable scenarios.
+        # The cost is the number of hands ranked, not the number of deals (those are counted),
+        # and suit symmetry folds boards together: 2M hands take about a second.
+        evaluations = ExactProbabilityCalculator.count_hand_evaluations(
+            player_ids, community_ids, len(remaining_deck), unknown_community
+        )
+        if num_opponents > 2 or evaluations > ExactProbabilityCalculator.MAX_EXACT_EVALUATIONS:
             return None  # Fall back to Monte Carlo
         
         wins = 0
         ties = 0
-        total_scenarios = 0
+        # Every board is followed by the same number of opponent deals, so the
+        # scenario count is known up front instead of being tallied in the loop.
+        total_scenarios = ExactProbabilityCalculator.count_scenarios(
+            len(remaining_deck), unknown_community, num_opponents
+        )
         
-        # Generate all possible combinations of unknown cards
-        for unknown_cards in combinations(remaining_deck, total_unknown_cards):
-            # Split unknown cards into community and opponent cards
-            final_community = community_cards + list(unknown_cards[:unknown_community])
-            opponent_cards_pool = list(unknown_cards[unknown_community:])
-            
-            # Create all possible opponent hand combinations
-            opponent_hands = []
-            start_idx = 0
-            for _ in range(num_opponents):
-                opponent_hand = opponent_cards_pool[start_idx:start_idx + cards_per_opponent]
-                opponent_hands.append(opponent_hand)
-                start_idx += cards_per_opponent
-            
-            # Evaluate player's hand
-            player_all_cards = player_cards + final_community
-            player_result = HandEvaluator.find_best_hand(player_all_cards)[:3]  # hand_type, rank, tie_breakers
+        # Suit relabelings that fix the player's cards and the community cards map each board
+        # onto one with the same outcome, so only one board per equivalence class is evaluated.
+        board_classes = ExactProbabilityCalculator.get_board_classes(
+            player_ids, community_ids, remaining_deck, unknown_community
+        )
+        
+        for board_cards, class_size in board_classes.items():
+            final_community = community_ids + list(board_cards)
             
-            # Evaluate all opponent hands
-            opponent_results = []
-            for opponent_hand in opponent_hands:
-                opponent_all_cards = opponent_hand + final_community
-                opponent_result = HandEvaluator.find_best_hand(opponent_all_cards)[:3]
-                opponent_results.append(opponent_result)
+            # The player's hand only depends on the board, so evaluate it once per board
+            player_rank = evaluate7(player_ids + final_community)  # lower rank is stronger
             
-            # Compare player vs all opponents
-            player_wins_scenario = True
-            player_ties_scenario = False
+            # Rank every possible opponent hand on this board in one batch
+            undealt = [card_id for card_id in remaining_deck if card_id not in board_cards]
+            hand_ranks = evaluate7_pairs(undealt, final_community)
             
-            for opponent_result in opponent_results:
-                comparison = HandEvaluator.compare_hands(player_result, opponent_result)
-                if comparison < 0:  # Player loses to this opponent
-                    player_wins_scenario = False
-                    break
-                elif comparison == 0:  # Tie with this opponent
-                    player_ties_scenario = True
+            if num_opponents == 1:
+                # Heads-up each hole pair is one deal: count the hands the player beats and ties
+                ties += class_size * hand_ranks.count(player_rank)
+                wins += class_size * len([rank for rank in hand_ranks if rank > player_rank])
+                continue
             
-            total_scenarios += 1
-            if player_wins_scenario:
-                if player_ties_scenario:
-                    ties += 1
-                else:
-                    wins += 1
+            # The player wins a deal when every opponent hand is weaker and ties when none is
+            # stronger, so counting deals made only of such hands replaces walking the deals.
+            hole_pairs = list(combinations(undealt, 2))
+            beaten = [pair for pair, rank in zip(hole_pairs, hand_ranks) if rank > player_rank]
+            not_stronger = [pair for pair, rank in zip(hole_pairs, hand_ranks) if rank >= player_rank]
+            beaten_deals = ExactProbabilityCalculator.count_opponent_deals(beaten, num_opponents)
+            wins += class_size * beaten_deals
+            ties += class_size * (ExactProbabilityCalculator.count_opponent_deals(not_stronger, num_opponents)
+                                  - beaten_deals)
         
         if total_scenarios == 0:
             return None
@@ -372,103 +760,182 @@ class ExactProbabilityCalculator:
         }
     
     @staticmethod
-    def monte_carlo_simulation(player_cards, community_cards, num_opponents, iterations=10000):
+    def monte_carlo_simulation(player_cards, community_cards, num_opponents, iterations=10000,
+                               paired_deals=True, rng=None, workers=1):
         """Monte Carlo simulation as fallback for complex scenarios."""
-        wins = 0
-        ties = 0
+        return ExactProbabilityCalculator.monte_carlo_simulation_batched(
+            player_cards, community_cards, num_opponents, [iterations], paired_deals, rng, workers
+        )[0]
+    
+    @staticmethod
+    def monte_carlo_equity(player_cards, community_cards, num_opponents, iterations=10000,
+                           paired_deals=True, rng=None, workers=1):
+        """Monte Carlo estimate of the player's equity: the pot share won, from 0.0 to 1.0.
         
-        for _ in range(iterations):
-            # Create a fresh deck and remove known cards
-            deck = Deck()
-            deck.cards = ExactProbabilityCalculator.get_remaining_deck(player_cards + community_cards)
-            deck.shuffle()
-            
-            # Deal remaining community cards
-            final_community = community_cards[:]
-            while len(final_community) < 5:
-                final_community.append(deck.draw_card())
-            
-            # Deal opponent hands
-            opponent_hands = []
-            for _ in range(num_opponents):
-                opponent_hand = [deck.draw_card(), deck.draw_card()]
-                opponent_hands.append(opponent_hand)
-            
-            # Evaluate player's hand
-            player_all_cards = player_cards + final_community
-            player_result = HandEvaluator.find_best_hand(player_all_cards)[:3]
+        A tie counts as half a win. Takes the same arguments as monte_carlo_simulation but
+        skips building the result dict, for callers that only need the one number.
+        """
+        wins, ties = ExactProbabilityCalculator._monte_carlo_counts(
+            player_cards, community_cards, num_opponents, [iterations], paired_deals, rng, workers
+        )[iterations]
+        return (2 * wins + ties) / (2 * iterations)
+    
+    @staticmethod
+    def equity(result):
+        """Equity (pot share won, 0.0 to 1.0; a tie counts as half a win) from a result dict.
+        
+        Works on the dicts returned by the exact calculation and the Monte Carlo simulation.
+        """
+        total = result['wins'] + result['ties'] + result['losses']
+        return (2 * result['wins'] + result['ties']) / (2 * total)
+    
+    @staticmethod
+    def monte_carlo_simulation_batched(player_cards, community_cards, num_opponents, checkpoints,
+                                       paired_deals=True, rng=None, workers=1):
+        """Run one simulation of max(checkpoints) iterations and report the estimate at each checkpoint.
+        
+        Returns one result dict (same shape as monte_carlo_simulation) per checkpoint, in the
+        order given. Each estimate uses the first N simulated deals, so the deck setup is paid once.
+        Cards may be Card objects or plain card ids, as for calculate_exact_probability.
+        paired_deals takes two card-disjoint deals from every shuffle (see _mc_kernel). Pass a seeded
+        random.Random as rng for reproducible results; by default the class-wide generator is used.
+        
+        With workers > 1 the iterations are split across that many processes (workers=None
+        uses every CPU core), taken from a pool that is kept for later runs. Each worker
+        gets its share of every checkpoint, so checkpoint N still sums exactly N deals.
+        Fewer processes are started when a run is too short to give each one
+        MIN_ITERATIONS_PER_WORKER deals.
+        """
+        snapshots = ExactProbabilityCalculator._monte_carlo_counts(
+            player_cards, community_cards, num_opponents, checkpoints, paired_deals, rng, workers
+        )
+        
+        results = []
+        for iterations in checkpoints:
+            wins, ties = snapshots[iterations]
+            win_probability = (wins / iterations) * 100
+            tie_probability = (ties / iterations) * 100
+            lose_probability = 100 - win_probability - tie_probability
             
-            # Evaluate opponent hands and compare
-            player_wins_round = True
-            player_ties_round = False
+            results.append({
+                'method': 'monte_carlo',
+                'iterations': iterations,
+                'wins': wins,
+                'ties': ties,
+                'losses': iterations - wins - ties,
+                'win_probability': win_probability,
+                'tie_probability': tie_probability,
+                'lose_probability': lose_probability
+            })
+        
+        return results
+    
+    @staticmethod
+    def _monte_carlo_counts(player_cards, community_cards, num_opponents, checkpoints, paired_deals,
+                            rng, workers):
+        """Run the simulation and return {checkpoint: (wins, ties)}; see monte_carlo_simulation_batched."""
+        if rng is None:
+            rng = ExactProbabilityCalculator._rng
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, max(checkpoints) // MIN_ITERATIONS_PER_WORKER))
+        # The unseen cards never change between iterations, so build them once.
+        remaining_ids = ExactProbabilityCalculator.get_remaining_ids(player_cards + community_cards)
+        player_ids = Card.to_id_array(player_cards).tolist()
+        community_ids = Card.to_id_array(community_cards).tolist()
+        
+        if workers > 1:
+            shares = [[n // workers + (i < n % workers) for n in checkpoints] for i in range(workers)]
+            seeds = [rng.getrandbits(64) for _ in range(workers)]
+            from concurrent.futures.process import BrokenProcessPool
             
-            for opponent_hand in opponent_hands:
-                opponent_all_cards = opponent_hand + final_community
-                opponent_result = HandEvaluator.find_best_hand(opponent_all_cards)[:3]
-                
-                comparison = HandEvaluator.compare_hands(player_result, opponent_result)
-                if comparison < 0:
-                    player_wins_round = False
-                    break
-                elif comparison == 0:
-                    player_ties_round = True
+            executor = _get_executor(workers)
+            try:
+                futures = [executor.submit(_mc_worker, player_ids, community_ids, remaining_ids,
+                                           num_opponents, share, paired_deals, seed)
+                           for share, seed in zip(shares, seeds)]
+                worker_snapshots = [future.result() for future in futures]
+            except BrokenProcessPool:
+                # A broken pool refuses all further work; replace it for the next run
+                _discard_executor()
+                raise
             
-            if player_wins_round:
-                if player_ties_round:
-                    ties += 1
-                else:
-                    wins += 1
-        
-        win_probability = (wins / iterations) * 100
-        tie_probability = (ties / iterations) * 100
-        lose_probability = 100 - win_probability - tie_probability
+            snapshots = {}
+            for j, n in enumerate(checkpoints):
+                # A worker with no share of this checkpoint has no snapshot for it
+                counts = [snapshot.get(share[j], (0, 0)) for share, snapshot in zip(shares, worker_snapshots)]
+                snapshots[n] = (sum(wins for wins, _ in counts), sum(ties for _, ties in counts))
+        else:
+            snapshots = _mc_kernel(player_ids, community_ids, remaining_ids, num_opponents,
+                                   max(checkpoints), set(checkpoints), paired_deals, rng)
         
-        return {
-            'method': 'monte_carlo',
-            'iterations': iterations,
-            'wins': wins,
-            'ties': ties,
-            'losses': iterations - wins - ties,
-            'win_probability': win_probability,
-            'tie_probability': tie_probability,
-            'lose_probability': lose_probability
-        }
+        return snapshots
+    
+    @staticmethod
+    def count_scenarios(num_unseen, unknown_community, num_opponents):
+        """Number of (board, opponent hands) deals the exact enumeration walks through."""
+        boards = math.comb(num_unseen, unknown_community)
+        cards_left = num_unseen - unknown_community
+        ordered_deals = 1
+        for i in range(num_opponents):
+            ordered_deals *= math.comb(cards_left - 2 * i, 2)
+        # Opponents are interchangeable, so the order hands are dealt in doesn't matter
+        return boards * ordered_deals // math.factorial(num_opponents)
+    
+    @staticmethod
+    def hybrid(player_cards, community_cards, num_opponents, exact_threshold=2_000_000, iterations=100_000,
+               workers=None):
+        """Exact result when it ranks fewer than exact_threshold hands, Monte Carlo otherwise.
+        
+        The exact cost is estimated with count_hand_evaluations. The Monte Carlo fallback
+        runs on workers processes (all CPU cores by default).
+        """
+        num_unseen = 52 - len(player_cards) - len(community_cards)
+        evaluations = ExactProbabilityCalculator.count_hand_evaluations(
+            Card.to_id_array(player_cards), Card.to_id_array(community_cards), num_unseen, 5 - len(community_cards)
+        )
+        if evaluations < exact_threshold:
+            try:
+                result = ExactProbabilityCalculator.calculate_exact_probability(
+                    player_cards, community_cards, num_opponents
+                )
+                if result is not None:
+                    return result
+            except (ValueError, MemoryError):
+                pass
+        
+        return ExactProbabilityCalculator.monte_carlo_simulation(
+            player_cards, community_cards, num_opponents, iterations, workers=workers
+        )
     
     @staticmethod
     def calculate_win_probability(player_cards, community_cards, num_opponents):
         """Calculate win probability using the best available method."""
-        try:
-            # Try exact calculation first
-            result = ExactProbabilityCalculator.calculate_exact_probability(
-                player_cards, community_cards, num_opponents
-            )
-            if result is not None:
-                return result
-        except (ValueError, MemoryError):
-            pass
-        
-        # Fall back to Monte Carlo
-        return ExactProbabilityCalculator.monte_carlo_simulation(
-            player_cards, community_cards, num_opponents
+        return ExactProbabilityCalculator.hybrid(
+            player_cards, community_cards, num_opponents, iterations=10000
         )
 
 def parse_card(card_str):
     """Parse a card string like 'AH' or 'As' into a Card object."""
+    card = _CARD_STR_TO_CARD.get(card_str.upper())
+    if card is not None:
+        return card
+    
+    # Not one of the 52 cards: work out which part is wrong for the error message
     if len(card_str) != 2:
         raise ValueError(f"Invalid card format: {card_str}")
     
     rank = card_str[0].upper()
-    suit = card_str[1].upper()
-    
-    # Validate rank
     if rank not in "23456789TJQKA":
         raise ValueError(f"Invalid rank: {rank}")
-    
-    # Validate suit
-    if suit not in "SCHD":
-        raise ValueError(f"Invalid suit: {suit}")
-    
-    return Card(rank, suit)
+    raise ValueError(f"Invalid suit: {card_str[1].upper()}")
+
+def parse_card_id(card_str):
+    """Parse a card string like "AS" straight to its card id."""
+    card_id = CARD_TO_ID.get(card_str.upper())
+    if card_id is None:
+        return parse_card(card_str).id  # raises the ValueError
+    return card_id
 
 def get_user_cards():
     """Get the player's hole cards from user input."""
@@ -587,12 +1054,15 @@ def run_interactive_calculator():
     all_cards = player_cards + community_cards
     if len(all_cards) >= 5:
         try:
-            hand_type, rank, tie_breakers, best_cards = HandEvaluator.find_best_hand(all_cards)
-            base_strength = HandEvaluator.get_hand_strength_percentage(hand_type)
+            rank, best_cards = HandEvaluator.find_best_hand(all_cards)
+            hand_type = hand_category(rank)
+            base_strength = HandEvaluator.get_category_strength_percentage(hand_category_id(rank))
             adjusted_strength, table_context = calculate_relative_hand_strength(hand_type, base_strength, num_players)
             
             print(f"\n🎯 BEST HAND: {hand_type}")
             print(f"🃏 Cards used: {' '.join(repr(card) for card in best_cards)}")
+            print(f"🏅 Hand rank: {rank:,} of {WORST_RANK:,} "
+                  f"(beats {HandEvaluator.get_rank_strength_percentage(rank)}% of hand classes)")
             print(f"💪 Base hand strength: {base_strength}%")
             print(f"📊 Adjusted strength: {adjusted_strength:.1f}% {table_context}")
             
@@ -686,7 +1156,7 @@ def run_hand_evaluator_tests():
     for i, (card_strs, expected) in enumerate(test_cases, 1):
         try:
             cards = [parse_card(card_str) for card_str in card_strs]
-            hand_type, _, _ = HandEvaluator.evaluate_hand(cards)
+            hand_type = hand_category(HandEvaluator.evaluate_hand(cards))
             strength = HandEvaluator.get_hand_strength_percentage(hand_type)
             if hand_type == expected:
                 print(f"✅ Test {i:2d}: {' '.join(card_strs):15} → {hand_type:15} ({strength}%)")
@@ -728,10 +1198,17 @@ def run_method_comparison_demo():
     # Monte Carlo Method
     print("\n🎲 METHOD 2: MONTE CARLO SIMULATION")
     print("-" * 40)
-    for iterations in [1000, 10000, 100000]:
-        mc_result = ExactProbabilityCalculator.monte_carlo_simulation(player_cards, community_cards, 1, iterations)
+    iterations_list = [1000, 10000, 100000]
+    mc_results = ExactProbabilityCalculator.monte_carlo_simulation_batched(player_cards, community_cards, 1, iterations_list,
+                                                                          paired_deals=True, workers=None)
+    for iterations, mc_result in zip(iterations_list, mc_results):
         win_error = abs(mc_result['win_probability'] - exact_result['win_probability'])
         print(f"📊 {iterations:,} sims: Win {mc_result['win_probability']:.3f}%, Tie {mc_result['tie_probability']:.3f}% (Error: ±{win_error:.3f}%)")
+    
+    # Equity of the longest run, from the same deals as its row above
+    mc_equity = ExactProbabilityCalculator.equity(mc_results[-1])
+    exact_equity = ExactProbabilityCalculator.equity(exact_result)
+    print(f"⚖️ Equity over {iterations_list[-1]:,} sims: {mc_equity:.3%} (exact: {exact_equity:.3%})")
 
     print("\n🤔 WHEN TO USE EACH METHOD:")
     print("=" * 50)
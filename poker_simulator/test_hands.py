@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 
-from poker import HandEvaluator, parse_card
+import math
+import random
+from itertools import combinations
+
+from poker import ExactProbabilityCalculator, HandEvaluator, hand_category, parse_card
 
 def test_all_hand_types():
     """Test all poker hand types."""
@@ -47,7 +51,7 @@ def test_all_hand_types():
     for i, (card_strs, expected) in enumerate(test_cases, 1):
         try:
             cards = [parse_card(card_str) for card_str in card_strs]
-            hand_type, rank, tie_breakers = HandEvaluator.evaluate_hand(cards)
+            hand_type = hand_category(HandEvaluator.evaluate_hand(cards))
             
             strength_percentage = HandEvaluator.get_hand_strength_percentage(hand_type)
             
@@ -70,6 +74,48 @@ def test_all_hand_types():
     else:
         print("🚨 Some tests failed. Check the implementation.")
 
+def test_rank_ordering():
+    """Test that stronger hands get lower ranks, including within a hand type."""
+    print("\n📏 Testing rank ordering...")
+    print("=" * 50)
+    
+    # Strongest first; each hand must rank strictly better than the next
+    hands = [
+        ["AS", "KS", "QS", "JS", "TS"],  # Royal Flush
+        ["5D", "4D", "3D", "2D", "AD"],  # Steel wheel, the weakest straight flush
+        ["AS", "AC", "AH", "AD", "KS"],  # Aces with a king
+        ["AS", "AC", "AH", "AD", "QS"],  # Aces with a queen
+        ["KS", "KC", "KH", "2S", "2C"],  # Full House
+        ["AH", "KH", "QH", "JH", "9H"],  # Flush
+        ["AS", "KC", "QH", "JD", "TS"],  # Broadway straight
+        ["5S", "4C", "3H", "2D", "AS"],  # Wheel
+        ["AS", "AC", "KH", "KD", "QS"],  # Two Pair, queen kicker
+        ["AS", "AC", "KH", "KD", "JS"],  # Two Pair, jack kicker
+        ["7S", "5C", "4H", "3D", "2S"],  # Worst possible hand
+    ]
+    ranks = [HandEvaluator.evaluate_hand([parse_card(card_str) for card_str in hand]) for hand in hands]
+    
+    failed = 0
+    for i in range(len(hands) - 1):
+        if HandEvaluator.compare_hands(ranks[i], ranks[i + 1]) != 1:
+            print(f"❌ {' '.join(hands[i])} (rank {ranks[i]}) should beat {' '.join(hands[i + 1])} (rank {ranks[i + 1]})")
+            failed += 1
+    
+    # Same ranks in a different suit are the same hand
+    same_hand = HandEvaluator.evaluate_hand([parse_card(card_str) for card_str in ["AH", "AD", "KS", "KC", "QD"]])
+    if HandEvaluator.compare_hands(same_hand, ranks[8]) != 0:
+        print(f"❌ AH AD KS KC QD (rank {same_hand}) should tie AS AC KH KD QS (rank {ranks[8]})")
+        failed += 1
+    
+    if ranks[0] != 1 or ranks[-1] != 7462:
+        print(f"❌ Expected ranks 1 and 7462 at the extremes, got {ranks[0]} and {ranks[-1]}")
+        failed += 1
+    
+    if failed == 0:
+        print(f"✅ {len(hands)} hands rank in order ({ranks[0]} ... {ranks[-1]})")
+    else:
+        print(f"🚨 {failed} ordering checks failed")
+
 def test_best_hand_from_seven():
     """Test finding best hand from 7 cards."""
     print("\n🎯 Testing best hand selection from 7 cards...")
@@ -83,7 +129,8 @@ def test_best_hand_from_seven():
     all_cards = [parse_card(card_str) for card_str in hole_cards + community_cards]
     
     try:
-        hand_type, rank, tie_breakers, best_cards = HandEvaluator.find_best_hand(all_cards)
+        rank, best_cards = HandEvaluator.find_best_hand(all_cards)
+        hand_type = hand_category(rank)
         
         strength_percentage = HandEvaluator.get_hand_strength_percentage(hand_type)
         
@@ -102,6 +149,93 @@ def test_best_hand_from_seven():
     except Exception as e:
         print(f"💥 Error: {e}")
 
+def brute_force_counts(player_cards, community_cards, num_opponents):
+    """Count (scenarios, wins, ties) by dealing out every board and every set of opponent hands."""
+    known = player_cards + community_cards
+    unseen = [card for card in (parse_card(rank + suit) for rank in "23456789TJQKA" for suit in "SCHD")
+              if card not in known]
+    scenarios = wins = ties = 0
+    
+    for board in combinations(unseen, 5 - len(community_cards)):
+        full_board = community_cards + list(board)
+        player_rank, _ = HandEvaluator.find_best_hand(player_cards + full_board)
+        rest = [card for card in unseen if card not in board]
+        hands = [(pair, HandEvaluator.find_best_hand(list(pair) + full_board)[0]) for pair in combinations(rest, 2)]
+        
+        for deal in combinations(hands, num_opponents):
+            # Skip deals where two opponents would hold the same card
+            if len({card for pair, _ in deal for card in pair}) < 2 * num_opponents:
+                continue
+            best_opponent = min(rank for _, rank in deal)
+            scenarios += 1
+            wins += player_rank < best_opponent
+            ties += player_rank == best_opponent
+    
+    return scenarios, wins, ties
+
+def test_exact_against_brute_force():
+    """Test the exact calculator's counts against dealing out every scenario."""
+    print("\n🧮 Testing exact probability against brute force...")
+    print("=" * 50)
+    
+    # (hole cards, community cards, opponents); small enough to enumerate directly
+    scenarios = [
+        (["AS", "KD"], ["2H", "2D", "9C", "TC", "5S"], 1),  # Heads-up river
+        (["7H", "7D"], ["AS", "KS", "QS", "2C"], 1),        # Heads-up turn
+        (["AS", "KD"], ["2H", "2D", "9C", "TC", "5S"], 2),  # Two opponents on the river
+        # Swapping spades and hearts maps the known cards onto themselves only by trading
+        # the player's AS KS with the board's AH KH, so it must not fold boards together
+        (["AS", "KS"], ["AH", "KH", "2C", "3D"], 1),
+        # Hearts and diamonds appear on no known card, so swapping them does fold boards
+        (["AS", "KS"], ["QS", "2C", "3C", "9S"], 1),
+    ]
+    
+    failed = 0
+    for hole, community, opponents in scenarios:
+        player_cards = [parse_card(card_str) for card_str in hole]
+        community_cards = [parse_card(card_str) for card_str in community]
+        expected = brute_force_counts(player_cards, community_cards, opponents)
+        result = ExactProbabilityCalculator.calculate_exact_probability(player_cards, community_cards, opponents)
+        got = (result['total_scenarios'], result['wins'], result['ties'])
+        
+        label = f"{' '.join(hole)} | {' '.join(community)} vs {opponents}"
+        if got == expected:
+            print(f"✅ {label:32} → {got[0]:,} scenarios, {got[1]:,} wins, {got[2]:,} ties")
+        else:
+            print(f"❌ {label:32} → got {got}, expected {expected} (scenarios, wins, ties)")
+            failed += 1
+    
+    if failed == 0:
+        print("🎉 Exact counts match brute force!")
+    else:
+        print(f"🚨 {failed} exact calculations disagree with brute force")
+
+def test_monte_carlo_equity():
+    """Test that monte_carlo_equity and equity() match win + tie/2 from the same seeded simulation."""
+    print("\n⚖️ Testing Monte Carlo equity...")
+    print("=" * 50)
+    
+    player_cards = [parse_card("AS"), parse_card("AC")]
+    community_cards = [parse_card("KH"), parse_card("QD"), parse_card("JS")]
+    result = ExactProbabilityCalculator.monte_carlo_simulation(
+        player_cards, community_cards, 1, 5000, rng=random.Random(7)
+    )
+    equity = ExactProbabilityCalculator.monte_carlo_equity(
+        player_cards, community_cards, 1, 5000, rng=random.Random(7)
+    )
+    expected = (result['win_probability'] + result['tie_probability'] / 2) / 100
+    
+    if math.isclose(equity, expected):
+        print(f"✅ Equity {equity:.4%} matches win {result['win_probability']:.2f}% + tie {result['tie_probability']:.2f}% / 2")
+    else:
+        print(f"❌ Equity {equity:.4%} differs from win + tie/2 = {expected:.4%}")
+    
+    result_equity = ExactProbabilityCalculator.equity(result)
+    if math.isclose(result_equity, expected):
+        print(f"✅ equity() of the result dict gives the same {result_equity:.4%}")
+    else:
+        print(f"❌ equity() of the result dict gives {result_equity:.4%}, expected {expected:.4%}")
+
 def demo_interactive_example():
     """Demo with your actual input from the game."""
     print("\n🎮 Testing your actual game example...")
@@ -113,7 +247,8 @@ def demo_interactive_example():
     
     all_cards = [parse_card(card_str) for card_str in hole_cards + community_cards]
     
-    hand_type, rank, tie_breakers, best_cards = HandEvaluator.find_best_hand(all_cards)
+    rank, best_cards = HandEvaluator.find_best_hand(all_cards)
+    hand_type = hand_category(rank)
     strength_percentage = HandEvaluator.get_hand_strength_percentage(hand_type)
     
     print(f"Your hole cards: {' '.join(hole_cards)}")
@@ -135,5 +270,8 @@ def demo_interactive_example():
 
 if __name__ == "__main__":
     test_all_hand_types()
+    test_rank_ordering()
     test_best_hand_from_seven()
+    test_exact_against_brute_force()
+    test_monte_carlo_equity()
     demo_interactive_example()